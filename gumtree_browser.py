@@ -0,0 +1,1023 @@
+"""Работа с браузером и переподача объявлений; единственный модуль, импортирующий selenium.
+
+Импортируется только командами, запускающими браузер (--once и планировщик): --check и
+проверка настроек в gumtree_auto_relister не загружают selenium.
+"""
+import time
+import logging
+import os
+import random
+import signal
+import threading
+import multiprocessing
+import traceback
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+)
+
+from gumtree_config import (
+    logger, log_handlers, _log_fatal, load_ad_data,
+    GUMTREE_EMAIL, GUMTREE_PASSWORD, RELIST_INTERVAL_HOURS, HEADLESS, SMALL_SHM,
+    BLOCK_IMAGES, BLOCK_RESOURCES, BLOCKED_URL_PATTERNS, AD_DATA_FILE, MAX_PARALLEL,
+    SELENIUM_REMOTE_URL, MAX_RETRIES, RANDOM_DELAY_MIN, RANDOM_DELAY_MAX, USE_BUMP,
+    DRIVER_MAX_USES, EXIT_OK, EXIT_FATAL_ERROR,
+)
+
+# Локаторы элементов страниц. CSS используется везде, где не нужен поиск по тексту:
+# Chrome выполняет его через нативный querySelectorAll, а не через движок XPath.
+_LOCATORS = {
+    "COOKIE_ACCEPT_BTN": (By.ID, "onetrust-accept-btn-handler"),
+    "LOGIN_EMAIL": (By.ID, "email"),
+    "LOGIN_PASSWORD": (By.ID, "password"),
+    "LOGIN_BTN": (By.XPATH, "//button[contains(text(), 'Sign in')]"),
+    "ACCOUNT_LINK": (By.CSS_SELECTOR, "a[href*='/my/ads']"),
+    "LOGIN_ERROR": (By.CSS_SELECTOR, "div[class*='error'], div[class*='alert']"),
+    "ADS_CONTAINER": (By.CLASS_NAME, "my-items-list"),
+    "AD_ITEMS": (By.CSS_SELECTOR, "div[class*='my-items-list'] > div[class*='item']"),
+    "DELETE_BTN_MENU": (By.XPATH, "//button[contains(text(), 'Delete') or contains(text(), 'Remove')]"),
+    "DELETE_ICON_BTN": (By.XPATH, "//div[contains(@class, 'my-items-list')]/div[contains(@class, 'item')][1]//button[contains(@aria-label, 'delete') or contains(@aria-label, 'remove')]"),
+    "CONFIRM_BTN": (By.XPATH, "//button[contains(text(), 'Confirm') or contains(text(), 'Yes') or contains(text(), 'Ok')]"),
+    "SUCCESS_INDICATOR": (By.CSS_SELECTOR, "div[class*='success'], div[class*='notification']"),
+    "BUMP_BTN": (By.XPATH, "//div[contains(@class, 'my-items-list')]/div[contains(@class, 'item')][1]//*[self::button or self::a][contains(text(), 'Move to top') or contains(text(), 'Bump')]"),
+    "POSTCODE": (By.ID, "postcode"),
+    "POSTCODE_CHECK_BTN": (By.XPATH, "//button[contains(text(), 'Check') or contains(text(), 'Find') or contains(@aria-label, 'check')]"),
+    "IMAGE_PREVIEW": (By.CSS_SELECTOR, ".image-preview"),
+    "FILE_INPUT": (By.CSS_SELECTOR, "input[type='file']"),
+    "SUBMIT_BTN": (By.XPATH, "//button[contains(text(), 'Post') or contains(text(), 'Submit') or contains(text(), 'Continue')]"),
+    "FINAL_CONFIRM_BTNS": (By.XPATH, "//button[contains(text(), 'Confirm') or contains(text(), 'Publish') or contains(text(), 'Done') or contains(text(), 'Post')]"),
+    "SUCCESS_MESSAGES": (By.XPATH, "//div[contains(@class, 'success') or contains(@class, 'notification') or contains(text(), 'successful')]"),
+}
+
+# Наибольшее ожидание миниатюры одного загруженного изображения, в секундах
+IMAGE_UPLOAD_WAIT = 2
+
+# Основные поля формы объявления: (id поля на странице, ключ в ad_data, пауза после заполнения в секундах)
+FORM_FIELDS = [
+    ("title", "title", 0),
+    ("description", "description", 0),
+    ("price", "price", 0),
+    ("postcode", "postcode", 1),  # Добавляем задержку после заполнения индекса
+    ("contactName", "contact_name", 0),
+    ("phoneNumber", "phone_number", 0),
+]
+
+# Разбор кнопок карточки объявления за один запрос к браузеру:
+# прямая кнопка Delete/Remove, кнопка контекстного меню и кнопка-иконка удаления
+_ITEM_BUTTONS_SCRIPT = """
+const buttons = Array.from(arguments[0].querySelectorAll("button"));
+const attr = (b, name) => b.getAttribute(name) || "";
+return {
+    direct: buttons.find(b => /Delete|Remove/.test(b.textContent)) || null,
+    menu: buttons.find(b => /menu|dropdown/.test(attr(b, "class")) || attr(b, "aria-label").includes("menu")) || null,
+    icon: buttons.find(b => /delete|remove/.test(attr(b, "aria-label"))) || null
+};
+"""
+
+class WebDriverWrapper:
+    """Обертка для WebDriver с дополнительными функциями и обработкой исключений"""
+    
+    def __init__(self):
+        self.driver = None
+        self.uses = 0
+    
+    def initialize(self):
+        """Инициализация веб-драйвера"""
+        options = webdriver.ChromeOptions()
+        
+        if HEADLESS:
+            options.add_argument("--headless=new")  # Новый формат для последних версий Chrome
+        
+        options.add_argument("--no-sandbox")
+        if SMALL_SHM:
+            options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-notifications")
+        options.add_argument("--disable-popup-blocking")
+        
+        # Флаги производительности: без фоновых сервисов и троттлинга вкладок
+        for flag in [
+            "--disable-background-networking",
+            "--disable-background-timer-throttling",
+            "--disable-backgrounding-occluded-windows",
+            "--disable-breakpad",
+            "--disable-client-side-phishing-detection",
+            "--disable-component-extensions-with-background-pages",
+            "--disable-default-apps",
+            "--disable-extensions",
+            "--disable-hang-monitor",
+            "--disable-ipc-flooding-protection",
+            "--disable-prompt-on-repost",
+            "--disable-renderer-backgrounding",
+            "--disable-sync",
+            "--force-color-profile=srgb",
+            "--hide-scrollbars",
+            "--metrics-recording-only",
+            "--mute-audio",
+            "--no-first-run",
+            "--password-store=basic",
+            "--use-mock-keychain",
+        ]:
+            options.add_argument(flag)
+        
+        # driver.get возвращается после DOMContentLoaded, не дожидаясь картинок и рекламы
+        options.page_load_strategy = "eager"
+        
+        if BLOCK_IMAGES:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        
+        # Использование user-agent для имитации реального пользователя
+        user_agents = [
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Safari/605.1.15"
+        ]
+        options.add_argument(f"user-agent={random.choice(user_agents)}")
+        
+        # Добавление аргумента для предотвращения обнаружения автоматизации
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        
+        if SELENIUM_REMOTE_URL:
+            self.driver = webdriver.Remote(command_executor=SELENIUM_REMOTE_URL, options=options)
+        else:
+            # Собственный лог chromedriver отключен, остаются только критические ошибки
+            service = Service(log_output=os.devnull, service_args=["--log-level=SEVERE"])
+            self.driver = webdriver.Chrome(service=service, options=options)
+        # Неявное ожидание отключено: все поиски используют явный WebDriverWait,
+        # а смешивание двух видов ожидания суммирует таймауты на каждой проверке
+        self.driver.implicitly_wait(0)
+        self.uses = 0
+        
+        if BLOCK_RESOURCES and self.supports_cdp():
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.set_url_blocking(True)
+        
+        return self.driver
+    
+    def supports_cdp(self):
+        """Команды DevTools доступны только у локального драйвера Chrome, не у webdriver.Remote"""
+        return hasattr(self.driver, "execute_cdp_cmd")
+    
+    def set_url_blocking(self, enabled):
+        """Включение или отключение блокировки тяжелых ресурсов на сетевом уровне"""
+        if not BLOCK_RESOURCES or not self.supports_cdp():
+            return
+        urls = BLOCKED_URL_PATTERNS if enabled else []
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+    
+    def is_alive(self):
+        """Проверка, что сессия браузера еще отвечает"""
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+    
+    def reset_session(self):
+        """Очистка cookies и хранилищ страницы перед повторным использованием браузера"""
+        self.driver.delete_all_cookies()
+        try:
+            self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException as e:
+            # Хранилище недоступно, например на about:blank
+            logger.debug("Не удалось очистить хранилище страницы: %s", e)
+    
+    def acquire(self):
+        """Получение драйвера для очередного запуска: переиспользует живую сессию или запускает новую"""
+        if self.driver and self.uses >= DRIVER_MAX_USES:
+            logger.info("Браузер использован %s раз, перезапуск", self.uses)
+            self.close()
+        elif self.driver and not self.is_alive():
+            logger.warning("Сессия браузера не отвечает, перезапуск")
+            self.close()
+        
+        if self.driver:
+            self.reset_session()
+        else:
+            self.initialize()
+        
+        self.uses += 1
+        return self.driver
+    
+    def safe_find_element(self, by, value, timeout=10, clickable=False):
+        """Безопасный поиск элемента с ожиданием"""
+        try:
+            if clickable:
+                element = WebDriverWait(self.driver, timeout).until(
+                    EC.element_to_be_clickable((by, value))
+                )
+            else:
+                element = WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located((by, value))
+                )
+            return element
+        except (TimeoutException, NoSuchElementException) as e:
+            logger.warning("Элемент не найден: %s=%s. Ошибка: %s", by, value, e)
+            return None
+    
+    def safe_find_elements(self, by, value, timeout=10):
+        """Безопасный поиск элементов с ожиданием"""
+        try:
+            # Список возвращается прямо из условия ожидания, без повторного запроса
+            return WebDriverWait(self.driver, timeout).until(
+                lambda d: d.find_elements(by, value) or False
+            )
+        except (TimeoutException, NoSuchElementException) as e:
+            logger.warning("Элементы не найдены: %s=%s. Ошибка: %s", by, value, e)
+            return []
+    
+    def safe_wait(self, condition, timeout=10):
+        """Ожидание произвольного условия; возвращает его результат или None по таймауту"""
+        try:
+            return WebDriverWait(self.driver, timeout).until(condition)
+        except TimeoutException:
+            return None
+    
+    def fast_set_value(self, field, value):
+        """Установка значения поля одним JS-вызовом вместо посимвольного send_keys
+        
+        Возвращает True, если поле действительно приняло значение.
+        Значение задается через сеттер прототипа: при прямом присваивании value
+        React и подобные фреймворки не видят изменения и игнорируют событие input.
+        """
+        self.driver.execute_script(
+            "Object.getOwnPropertyDescriptor(Object.getPrototypeOf(arguments[0]), 'value').set"
+            ".call(arguments[0], arguments[1]);"
+            "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));"
+            "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));",
+            field, value
+        )
+        return field.get_attribute("value") == value
+    
+    def safe_click(self, element, retry=3):
+        """Безопасный клик по элементу с повторными попытками"""
+        for attempt in range(retry):
+            try:
+                if element:
+                    element.click()
+                    return True
+            except (StaleElementReferenceException, TimeoutException) as e:
+                if attempt < retry - 1:
+                    logger.warning("Ошибка при клике, повторная попытка %s: %s", attempt+1, e)
+                    time.sleep(1)
+                else:
+                    logger.error("Не удалось выполнить клик после %s попыток: %s", retry, e)
+                    return False
+        return False
+    
+    def close(self):
+        """Закрытие драйвера"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                logger.warning("Ошибка при закрытии драйвера: %s", e)
+            self.driver = None
+            self.uses = 0
+
+class GumtreeAutoRelister:
+    """Основной класс для автоматической переподачи объявлений на Gumtree"""
+    
+    def __init__(self, email=None, password=None, ad_data_file=None):
+        self.email = email or GUMTREE_EMAIL
+        self.password = password or GUMTREE_PASSWORD
+        self.ad_data_file = ad_data_file or AD_DATA_FILE
+        self.driver_wrapper = WebDriverWrapper()
+        self.ad_data = None
+        self._ad_data_mtime = None
+        self._cached_valid_images = None  # (ad_data, список абсолютных путей)
+        self._fill_plan = []
+        self._additional_fill_plan = []
+        self.stop_event = threading.Event()  # устанавливается сигналом остановки планировщика
+    
+    def login_to_gumtree(self):
+        """Вход в аккаунт Gumtree"""
+        driver = self.driver_wrapper.driver
+        try:
+            logger.info("Открытие страницы логина...")
+            driver.get("https://www.gumtree.com/signin")
+            
+            # Ожидание загрузки страницы и принятие cookies если необходимо
+            cookie_button = self.driver_wrapper.safe_find_element(*_LOCATORS["COOKIE_ACCEPT_BTN"], timeout=5, clickable=True)
+            if cookie_button:
+                self.driver_wrapper.safe_click(cookie_button)
+                logger.info("Cookies приняты")
+            
+            # Проверка наличия формы входа
+            email_field = self.driver_wrapper.safe_find_element(*_LOCATORS["LOGIN_EMAIL"], timeout=10)
+            if not email_field:
+                logger.error("Форма входа не найдена")
+                return False
+            
+            # Ввод email
+            logger.info("Ввод email...")
+            email_field.clear()
+            email_field.send_keys(self.email)
+            
+            # Ввод пароля
+            logger.info("Ввод пароля...")
+            password_field = self.driver_wrapper.safe_find_element(*_LOCATORS["LOGIN_PASSWORD"])
+            if password_field:
+                password_field.clear()
+                password_field.send_keys(self.password)
+            else:
+                logger.error("Поле пароля не найдено")
+                return False
+            
+            # Нажатие кнопки логина
+            logger.info("Нажатие кнопки входа...")
+            login_button = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["LOGIN_BTN"], clickable=True
+            )
+            if not login_button:
+                logger.error("Кнопка входа не найдена")
+                return False
+                
+            self.driver_wrapper.safe_click(login_button)
+            
+            # Ожидание успешного входа
+            account_link = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["ACCOUNT_LINK"], timeout=15
+            )
+            
+            if account_link:
+                logger.info("Вход выполнен успешно")
+                return True
+            else:
+                # Дополнительная проверка на наличие ошибки входа
+                error_element = self.driver_wrapper.safe_find_element(
+                    *_LOCATORS["LOGIN_ERROR"], timeout=3
+                )
+                if error_element:
+                    logger.error("Ошибка входа: %s", error_element.text)
+                else:
+                    logger.error("Не удалось подтвердить успешный вход")
+                return False
+            
+        except Exception as e:
+            logger.error("Ошибка при попытке входа: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            return False
+    
+    def delete_ad(self):
+        """Удаление существующего объявления"""
+        driver = self.driver_wrapper.driver
+        try:
+            logger.info("Переход на страницу моих объявлений...")
+            driver.get("https://www.gumtree.com/my/ads")
+            
+            # Ожидание загрузки страницы с объявлениями
+            ads_container = self.driver_wrapper.safe_find_element(*_LOCATORS["ADS_CONTAINER"], timeout=10)
+            if not ads_container:
+                logger.warning("Контейнер с объявлениями не найден. Возможно, объявлений нет или структура страницы изменилась.")
+                return True  # Считаем успешным, если контейнер не найден, т.к. нет объявлений для удаления
+            
+            # Проверка наличия объявлений
+            ad_elements = self.driver_wrapper.safe_find_elements(
+                *_LOCATORS["AD_ITEMS"]
+            )
+            
+            if not ad_elements:
+                logger.warning("Объявления не найдены. Нечего удалять.")
+                return True  # Возвращаем True, так как нет объявлений для удаления
+            
+            logger.info("Найдено %s объявлений", len(ad_elements))
+            
+            # Все кандидаты на кнопку удаления в первой карточке ищем одним запросом
+            item_buttons = driver.execute_script(_ITEM_BUTTONS_SCRIPT, ad_elements[0])
+            
+            # 1. Прямая кнопка Delete/Remove
+            delete_button = item_buttons["direct"]
+            
+            # 2. Если кнопка не найдена напрямую, ищем контекстное меню
+            menu_clicked = False
+            if not delete_button:
+                logger.info("Прямая кнопка удаления не найдена, ищем через меню...")
+                menu_button = item_buttons["menu"]
+                
+                if menu_button:
+                    menu_clicked = self.driver_wrapper.safe_click(menu_button)
+                    
+                    # Поиск кнопки Delete/Remove в открытом меню
+                    delete_button = self.driver_wrapper.safe_find_element(
+                        *_LOCATORS["DELETE_BTN_MENU"],
+                        timeout=5,
+                        clickable=True
+                    )
+            
+            # 3. Если всё еще не нашли, попробуем поискать по иконкам
+            if not delete_button:
+                logger.info("Ищем кнопку удаления по иконкам...")
+                if menu_clicked:
+                    # Открытие меню может перерисовать карточку: найденная ранее иконка устарела
+                    delete_button = self.driver_wrapper.safe_find_element(
+                        *_LOCATORS["DELETE_ICON_BTN"],
+                        timeout=5,
+                        clickable=True
+                    )
+                else:
+                    delete_button = item_buttons["icon"]
+            
+            if not delete_button:
+                logger.error("Не удалось найти кнопку удаления объявления после всех попыток")
+                # Добавляем скриншот для диагностики
+                screenshot_path = f"logs/error_delete_button_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+                driver.save_screenshot(screenshot_path)
+                logger.info("Сохранен скриншот: %s", screenshot_path)
+                return False
+            
+            # Нажимаем на кнопку Delete
+            logger.info("Нажатие на кнопку удаления...")
+            if not self.driver_wrapper.safe_click(delete_button):
+                logger.error("Не удалось нажать на кнопку удаления")
+                return False
+            
+            # Ожидание появления и нажатие на кнопку подтверждения
+            confirm_button = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["CONFIRM_BTN"],
+                timeout=5,
+                clickable=True
+            )
+            
+            if confirm_button:
+                if self.driver_wrapper.safe_click(confirm_button):
+                    logger.info("Подтверждение удаления выполнено")
+                    
+                    # Ожидаем исчезновения удаляемой карточки или смены URL
+                    current_url = driver.current_url
+                    self.driver_wrapper.safe_wait(
+                        EC.any_of(EC.staleness_of(ad_elements[0]), EC.url_changes(current_url)),
+                        timeout=3
+                    )
+                    
+                    # Проверяем, что объявление исчезло или появилось сообщение об успешном удалении
+                    success_indicator = self.driver_wrapper.safe_find_element(
+                        *_LOCATORS["SUCCESS_INDICATOR"],
+                        timeout=5
+                    )
+                    
+                    if success_indicator:
+                        logger.info("Получено подтверждение: %s", success_indicator.text)
+                    
+                    # Проверяем, что объявление удалено, перезагрузив страницу
+                    driver.refresh()
+                    
+                    # Проверяем, что объявлений стало меньше или они исчезли
+                    new_ad_elements = self.driver_wrapper.safe_find_elements(
+                        *_LOCATORS["AD_ITEMS"],
+                        timeout=5
+                    )
+                    
+                    if not new_ad_elements or len(new_ad_elements) < len(ad_elements):
+                        logger.info("Объявление успешно удалено")
+                        return True
+                    else:
+                        logger.warning("Количество объявлений не изменилось после удаления")
+                        return False
+                else:
+                    logger.error("Не удалось нажать на кнопку подтверждения")
+                    return False
+            else:
+                logger.error("Кнопка подтверждения удаления не найдена")
+                return False
+            
+        except Exception as e:
+            logger.error("Ошибка при удалении объявления: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            return False
+    
+    def bump_ad(self):
+        """Поднятие существующего объявления в начало списка без повторной подачи"""
+        driver = self.driver_wrapper.driver
+        try:
+            logger.info("Переход на страницу моих объявлений для поднятия...")
+            driver.get("https://www.gumtree.com/my/ads")
+            
+            bump_button = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["BUMP_BTN"],
+                timeout=5,
+                clickable=True
+            )
+            if not bump_button:
+                logger.info("Кнопка поднятия объявления недоступна")
+                return False
+            
+            logger.info("Нажатие на кнопку поднятия объявления...")
+            if not self.driver_wrapper.safe_click(bump_button):
+                logger.error("Не удалось нажать на кнопку поднятия объявления")
+                return False
+            
+            # Подтверждение, если сайт его запрашивает
+            confirm_button = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["CONFIRM_BTN"],
+                timeout=3,
+                clickable=True
+            )
+            if confirm_button:
+                self.driver_wrapper.safe_click(confirm_button)
+            
+            success_indicator = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["SUCCESS_INDICATOR"],
+                timeout=5
+            )
+            # Без подтверждения кнопка могла вести на оплату или другое предложение:
+            # возвращаем False, чтобы run_job выполнил удаление и повторную подачу
+            if not success_indicator:
+                logger.warning("Подтверждение поднятия объявления не получено")
+                return False
+            
+            logger.info("Объявление поднято: %s", success_indicator.text)
+            return True
+            
+        except Exception as e:
+            logger.error("Ошибка при поднятии объявления: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            return False
+    
+    def load_ad_data(self):
+        """Загрузка данных объявления из файла; повторно файл читается только после изменения"""
+        ad_data_path = Path(self.ad_data_file)
+        
+        # Файл не менялся с прошлой загрузки - используем уже разобранные данные
+        try:
+            mtime = os.stat(ad_data_path).st_mtime
+        except OSError:
+            mtime = None
+        if self.ad_data is not None and mtime is not None and mtime == self._ad_data_mtime:
+            return self.ad_data
+        
+        ad_data = load_ad_data(ad_data_path)
+        if ad_data is None:
+            return None
+        
+        # Порядок заполнения формы вычисляется один раз при загрузке данных
+        self._fill_plan = [(field_id, ad_data.get(key), wait) for field_id, key, wait in FORM_FIELDS]
+        self._additional_fill_plan = list(ad_data.get("additional_fields", {}).items())
+        
+        self.ad_data = ad_data
+        self._ad_data_mtime = mtime
+        return ad_data
+    
+    def get_valid_images(self, ad_data):
+        """Абсолютные пути существующих изображений объявления, кэшируются до перезагрузки данных"""
+        if self._cached_valid_images and self._cached_valid_images[0] is ad_data:
+            return self._cached_valid_images[1]
+        
+        valid_images = []
+        for img_path in ad_data.get("image_paths") or []:
+            img_file = Path(img_path)
+            if img_file.exists():
+                valid_images.append(str(img_file.absolute()))
+            else:
+                logger.warning("Изображение не найдено: %s", img_path)
+        
+        self._cached_valid_images = (ad_data, valid_images)
+        return valid_images
+    
+    def create_ad(self):
+        """Создание нового объявления из предоставленных данных"""
+        driver = self.driver_wrapper.driver
+        
+        # Загрузка данных из файла, если еще не загружены
+        if not self.ad_data:
+            ad_data = self.load_ad_data()
+            if not ad_data:
+                logger.error("Не удалось получить данные для создания объявления")
+                return False
+        else:
+            ad_data = self.ad_data
+        
+        try:
+            logger.info("Начало создания нового объявления...")
+            
+            # Переход на страницу подачи объявления в нужной категории
+            category_url = ad_data.get("category_url", "https://www.gumtree.com/post-ad")
+            driver.get(category_url)
+            
+            # Ожидание загрузки формы
+            postcode_field = self.driver_wrapper.safe_find_element(*_LOCATORS["POSTCODE"], timeout=15)
+            if not postcode_field:
+                logger.error("Форма создания объявления не загрузилась")
+                screenshot_path = f"logs/error_create_form_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+                driver.save_screenshot(screenshot_path)
+                logger.info("Сохранен скриншот: %s", screenshot_path)
+                return False
+            
+            # Поля без посимвольной валидации заполняются через JS; индекс вводится
+            # по символам, так как подсказки адреса срабатывают на нажатия клавиш
+            fast_fields = {"title", "description"}
+            
+            # Функция для безопасного заполнения полей формы
+            def fill_field(field_id, value, field_type="input", wait_after=0):
+                if not value:
+                    return True
+                
+                field = self.driver_wrapper.safe_find_element(By.ID, field_id, timeout=5)
+                if field:
+                    try:
+                        if field_id not in fast_fields or not self.driver_wrapper.fast_set_value(field, value):
+                            field.clear()
+                            field.send_keys(value)
+                        if wait_after > 0:
+                            time.sleep(wait_after)
+                        logger.info("Поле %s заполнено: %.20s%s", field_id, value, "..." if len(str(value)) > 20 else "")
+                        return True
+                    except Exception as e:
+                        logger.warning("Не удалось заполнить поле %s: %s", field_id, e)
+                        return False
+                else:
+                    logger.warning("Поле %s не найдено", field_id)
+                    return False
+            
+            # Заполнение основных полей формы
+            for field_id, field_value, wait_time in self._fill_plan:
+                fill_field(field_id, field_value, wait_after=wait_time)
+            
+            # Проверка почтового индекса, если необходимо
+            if ad_data.get("postcode"):
+                check_button = self.driver_wrapper.safe_find_element(
+                    *_LOCATORS["POSTCODE_CHECK_BTN"],
+                    timeout=3,
+                    clickable=True
+                )
+                
+                if check_button:
+                    self.driver_wrapper.safe_click(check_button)
+                    logger.info("Нажата кнопка проверки индекса")
+                    # Ожидание проверки индекса: кнопка скрывается или заменяется результатом
+                    self.driver_wrapper.safe_wait(EC.invisibility_of_element(check_button), timeout=2)
+            
+            # Заполнение дополнительных полей (специфичные для категории)
+            for field_id, field_value in self._additional_fill_plan:
+                fill_field(field_id, field_value)
+            
+            # Обработка выпадающих списков
+            if "dropdowns" in ad_data:
+                for dropdown_id, dropdown_value in ad_data["dropdowns"].items():
+                    try:
+                        dropdown_element = self.driver_wrapper.safe_find_element(By.ID, dropdown_id, timeout=5)
+                        if dropdown_element:
+                            dropdown = Select(dropdown_element)
+                            dropdown.select_by_visible_text(dropdown_value)
+                            logger.info("Выпадающий список %s заполнен значением %s", dropdown_id, dropdown_value)
+                        else:
+                            logger.warning("Выпадающий список %s не найден", dropdown_id)
+                    except Exception as e:
+                        logger.warning("Не удалось заполнить выпадающий список %s: %s", dropdown_id, e)
+            
+            # Загрузка изображений
+            if "image_paths" in ad_data and ad_data["image_paths"]:
+                try:
+                    upload_button = self.driver_wrapper.safe_find_element(
+                        *_LOCATORS["FILE_INPUT"], timeout=5
+                    )
+                    
+                    if upload_button:
+                        # На время загрузки снимаем сетевую блокировку BLOCK_RESOURCES: запросы виджета
+                        # к картинкам (*.png, *.jpg) иначе отклоняются. Отрисовку картинок при этом
+                        # по-прежнему отключает BLOCK_IMAGES, но элементы миниатюр создаются и ожидание
+                        # ниже их находит, так как проверяет наличие элементов, а не изображение
+                        self.driver_wrapper.set_url_blocking(False)
+                        
+                        # Проверяем существование файлов перед загрузкой
+                        valid_images = self.get_valid_images(ad_data)
+                        
+                        if valid_images:
+                            # Селектор миниатюр не сверен с виджетом загрузки Gumtree, поэтому ожидание
+                            # ограничено прежней паузой в 2 секунды на изображение: если миниатюры
+                            # не находятся, загрузка идет не дольше, чем раньше
+                            previews_before = len(driver.find_elements(*_LOCATORS["IMAGE_PREVIEW"]))
+                            
+                            def previews_loaded(count):
+                                return lambda d: len(d.find_elements(*_LOCATORS["IMAGE_PREVIEW"])) >= previews_before + count
+                            
+                            if upload_button.get_attribute("multiple") is not None:
+                                # Загружаем все изображения одним вызовом: поле принимает пути через перевод строки
+                                upload_button.send_keys("\n".join(valid_images))
+                                previews = self.driver_wrapper.safe_wait(
+                                    previews_loaded(len(valid_images)),
+                                    timeout=IMAGE_UPLOAD_WAIT * len(valid_images)
+                                )
+                            else:
+                                # Поле без атрибута multiple принимает только один файл за вызов
+                                for index, img_path in enumerate(valid_images, start=1):
+                                    upload_button.send_keys(img_path)
+                                    previews = self.driver_wrapper.safe_wait(previews_loaded(index), timeout=IMAGE_UPLOAD_WAIT)
+                                    logger.info("Загружено изображение: %s", img_path)
+                            
+                            if not previews:
+                                logger.info("Миниатюры загруженных изображений не найдены за отведенное время")
+                            logger.info("Загружено %s изображений", len(valid_images))
+                        else:
+                            logger.warning("Не найдено ни одного изображения для загрузки")
+                    else:
+                        logger.warning("Кнопка загрузки изображений не найдена")
+                except Exception as e:
+                    logger.warning("Не удалось загрузить изображения: %s", e)
+                finally:
+                    self.driver_wrapper.set_url_blocking(True)
+            
+            # Отправка формы
+            submit_button = self.driver_wrapper.safe_find_element(
+                *_LOCATORS["SUBMIT_BTN"],
+                timeout=5,
+                clickable=True
+            )
+            
+            if not submit_button:
+                logger.error("Кнопка отправки формы не найдена")
+                screenshot_path = f"logs/error_submit_button_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+                driver.save_screenshot(screenshot_path)
+                logger.info("Сохранен скриншот: %s", screenshot_path)
+                return False
+            
+            # Сообщения, уже бывшие на странице формы, не считаются подтверждением отправки
+            messages_before = {element.id for element in driver.find_elements(*_LOCATORS["SUCCESS_MESSAGES"])}
+            
+            logger.info("Нажатие на кнопку отправки формы...")
+            if not self.driver_wrapper.safe_click(submit_button):
+                logger.error("Не удалось нажать на кнопку отправки формы")
+                return False
+            
+            logger.info("Форма отправлена, ожидание подтверждения...")
+            success_keywords = ["success", "published", "confirmation"]
+            
+            # Кнопки дополнительных шагов нажимаются прямо во время ожидания, каждая не более одного раза
+            clicked_buttons = {submit_button.id}
+            
+            def click_final_buttons(d):
+                for button in d.find_elements(*_LOCATORS["FINAL_CONFIRM_BTNS"]):
+                    if button.id in clicked_buttons:
+                        continue
+                    clicked_buttons.add(button.id)
+                    if self.driver_wrapper.safe_click(button):
+                        logger.info("Нажата кнопка окончательного подтверждения")
+                return False
+            
+            def new_success_message(d):
+                for element in d.find_elements(*_LOCATORS["SUCCESS_MESSAGES"]):
+                    if element.id not in messages_before:
+                        return element
+                return False
+            
+            # Одно ожидание вместо последовательных: успешный URL, сообщение об успехе или дополнительный шаг.
+            # any_of останавливается на первом истинном условии, поэтому кнопки подтверждения проверяются
+            # первыми: click_final_buttons всегда возвращает False и не прерывает проверку остальных условий
+            success_message = self.driver_wrapper.safe_wait(
+                EC.any_of(
+                    click_final_buttons,
+                    *[EC.url_contains(keyword) for keyword in success_keywords],
+                    new_success_message
+                ),
+                timeout=15
+            )
+            
+            # Проверка успешного создания объявления
+            if any(keyword in driver.current_url for keyword in success_keywords):
+                logger.info("Объявление успешно создано")
+                return True
+            
+            if success_message:
+                logger.info("Найдено сообщение об успехе: %s", success_message.text)
+                return True
+            
+            # Последняя проверка - просто проверим, что мы находимся не на странице редактирования
+            if "post-ad" not in driver.current_url and "edit" not in driver.current_url:
+                logger.info("Считаем объявление созданным, так как мы покинули страницу создания")
+                return True
+                
+            logger.warning("Не удалось подтвердить успешное создание объявления")
+            screenshot_path = f"logs/uncertain_creation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            driver.save_screenshot(screenshot_path)
+            logger.info("Сохранен скриншот: %s", screenshot_path)
+            return False
+                
+        except Exception as e:
+            logger.error("Ошибка при создании объявления: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            screenshot_path = f"logs/error_creation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            driver.save_screenshot(screenshot_path)
+            logger.info("Сохранен скриншот: %s", screenshot_path)
+            return False
+    
+    def run_job(self):
+        """Основная функция для запуска задачи переподачи объявления"""
+        logger.info("Запуск автоматической переподачи объявления...")
+        
+        # Добавление случайной задержки для уменьшения подозрительности
+        if RANDOM_DELAY_MAX > 0:
+            delay_minutes = random.randint(RANDOM_DELAY_MIN, RANDOM_DELAY_MAX)
+            if delay_minutes > 0:
+                logger.info("Добавлена случайная задержка: %s минут", delay_minutes)
+                if self.stop_event.wait(delay_minutes * 60):
+                    logger.info("Задача отменена во время задержки")
+                    return False
+        
+        # Получение драйвера (переиспользуется между запусками)
+        try:
+            self.driver_wrapper.acquire()
+        except Exception as e:
+            logger.error("Не удалось инициализировать драйвер: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            return False
+        
+        success = False
+        try:
+            # Предварительная загрузка данных объявления
+            if not self.load_ad_data():
+                return False
+            # Вход в аккаунт
+            if not self.login_to_gumtree():
+                logger.error("Не удалось выполнить вход в аккаунт Gumtree")
+                return False
+            
+            # Поднятие объявления, если включено; при недоступности - полная переподача
+            if USE_BUMP:
+                logger.info("Поднятие существующего объявления...")
+                if self.bump_ad():
+                    logger.info("Задача автоматической переподачи объявления выполнена успешно")
+                    return True
+                logger.warning("Не удалось поднять объявление, выполняется удаление и повторная подача")
+            
+            # Удаление существующего объявления
+            logger.info("Удаление существующего объявления...")
+            if not self.delete_ad():
+                logger.warning("Не удалось удалить существующее объявление или объявление не найдено")
+                # Продолжаем работу, так как отсутствие объявления не критично
+            
+            # Создание нового объявления
+            logger.info("Создание нового объявления...")
+            for attempt in range(MAX_RETRIES):
+                if self.create_ad():
+                    logger.info("Объявление успешно создано")
+                    success = True
+                    break
+                else:
+                    logger.warning("Попытка %s/%s создания объявления не удалась", attempt+1, MAX_RETRIES)
+                    time.sleep(5)  # Ожидание перед повторной попыткой
+            
+            if not success:
+                logger.error("Не удалось создать объявление после %s попыток", MAX_RETRIES)
+                return False
+            
+            logger.info("Задача автоматической переподачи объявления выполнена успешно")
+            return True
+            
+        except WebDriverException as e:
+            # Сессия браузера повреждена: закрываем, следующий запуск поднимет новую
+            logger.error("Ошибка браузера при выполнении задачи переподачи: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            self.driver_wrapper.close()
+            return False
+        except Exception as e:
+            logger.error("Ошибка при выполнении задачи переподачи: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            return False
+    
+    def start_scheduler(self, accounts=None):
+        """Запуск планировщика для регулярного выполнения задачи
+        
+        Если передан список аккаунтов, каждый запуск обрабатывает их параллельно в отдельных процессах.
+        Возвращает True при остановке по сигналу и False при фатальной ошибке планировщика.
+        """
+        logger.info("Запуск планировщика с интервалом %s часов", RELIST_INTERVAL_HOURS)
+        
+        if accounts:
+            logger.info("Аккаунтов для обработки: %s, параллельно до %s", len(accounts), MAX_PARALLEL)
+            job = lambda: run_accounts_parallel(accounts, self.stop_event)
+        else:
+            job = self.run_job
+            # Браузер запускается один раз и переиспользуется между запусками задачи
+            try:
+                self.driver_wrapper.initialize()
+            except Exception as e:
+                logger.error("Не удалось инициализировать драйвер: %s", e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(traceback.format_exc())
+        
+        previous_handlers = _install_stop_handlers(self.stop_event)
+        
+        try:
+            # Первый запуск сразу, затем ожидание ровно до следующего запуска вместо ежеминутной проверки
+            while not self.stop_event.is_set():
+                job()
+                next_run = datetime.now() + timedelta(hours=RELIST_INTERVAL_HOURS)
+                logger.info("Следующий запуск: %s", next_run.strftime('%Y-%m-%d %H:%M:%S'))
+                self.stop_event.wait(max(0, (next_run - datetime.now()).total_seconds()))
+            logger.info("Получен сигнал остановки, планировщик остановлен")
+            return True
+        except KeyboardInterrupt:
+            logger.info("Повторный сигнал остановки, текущий запуск прерван")
+            return True
+        except Exception as e:
+            _log_fatal("Ошибка в планировщике", e)
+            return False
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            self.driver_wrapper.close()
+
+def _install_stop_handlers(stop_event):
+    """Установка обработчиков SIGINT/SIGTERM, выставляющих stop_event; возвращает прежние обработчики
+    
+    Первый сигнал только выставляет флаг: ожидание прерывается, текущий запуск завершается штатно.
+    Затем восстанавливается прежний обработчик SIGINT, и повторный Ctrl+C прерывает запуск через
+    KeyboardInterrupt; повторный SIGTERM по-прежнему только выставляет флаг.
+    stop_event должен быть threading.Event: обработчик выполняется в главном потоке, и set() у
+    multiprocessing.Event, ожидающего в этом же потоке, зависает навсегда. По той же причине
+    в обработчике нет логирования: запись в QueueHandler берет блокировку очереди.
+    """
+    previous_handlers = {}
+    
+    def request_stop(signum, frame):
+        stop_event.set()
+        signal.signal(signal.SIGINT, previous_handlers[signal.SIGINT])
+    
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous_handlers[sig] = signal.signal(sig, request_stop)
+    return previous_handlers
+
+def init_worker():
+    """Инициализация дочернего процесса: прямая запись логов и стандартные обработчики сигналов"""
+    # Поток QueueListener в дочернем процессе не запущен
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    for handler in log_handlers:
+        root_logger.addHandler(handler)
+    
+    # Унаследованные от родителя обработчики ссылаются на его объекты
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def run_account_job(account):
+    """Выполнение задачи переподачи для одного аккаунта в отдельном процессе со своим браузером
+    
+    Результат передается кодом завершения процесса: EXIT_OK при успешной переподаче.
+    SIGTERM (его пересылает родитель при остановке) и Ctrl+C прерывают случайную задержку.
+    """
+    init_worker()
+    relister = GumtreeAutoRelister(**account)
+    _install_stop_handlers(relister.stop_event)
+    try:
+        success = relister.run_job()
+    finally:
+        relister.driver_wrapper.close()
+    raise SystemExit(EXIT_OK if success else EXIT_FATAL_ERROR)
+
+def run_accounts_parallel(accounts, stop_event=None):
+    """Параллельная переподача объявлений для нескольких аккаунтов
+    
+    После установки stop_event работающим процессам пересылается SIGTERM, новые не запускаются.
+    """
+    from multiprocessing.connection import wait
+    
+    # Отдельный процесс на аккаунт, а не общий пул: пул после падения одного процесса (например, вместе
+    # с Chrome) помечается сломанным целиком, а здесь падение влияет только на свой аккаунт
+    pending = list(accounts)
+    running = {}  # sentinel процесса -> (процесс, аккаунт)
+    results = []
+    stopping = False
+    while running or (pending and not stopping):
+        while pending and not stopping and len(running) < MAX_PARALLEL:
+            account = pending.pop(0)
+            process = multiprocessing.Process(target=run_account_job, args=(account,))
+            process.start()
+            running[process.sentinel] = (process, account)
+        
+        # Сигнал не прерывает wait() (PEP 475), поэтому флаг остановки проверяется раз в секунду;
+        # пересылка выполняется здесь, в главном потоке, а не в обработчике сигнала
+        finished = wait(list(running), timeout=None if stop_event is None or stopping else 1)
+        if stop_event is not None and stop_event.is_set() and not stopping:
+            stopping = True
+            for process, _ in running.values():
+                process.terminate()
+        
+        for sentinel in finished:
+            process, account = running.pop(sentinel)
+            process.join()
+            success = process.exitcode == EXIT_OK
+            if not success:
+                logger.warning("Переподача для аккаунта %s не выполнена (код завершения процесса %s)",
+                               account["email"], process.exitcode)
+            results.append(success)
+    
+    for account in pending:
+        logger.warning("Переподача для аккаунта %s пропущена: планировщик остановлен", account["email"])
+        results.append(False)
+    return all(results)
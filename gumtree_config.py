@@ -0,0 +1,137 @@
+"""Настройки, логирование и загрузка данных объявления; модуль не зависит от selenium"""
+import logging
+import logging.handlers
+import queue
+import atexit
+import os
+import json
+import traceback
+from pathlib import Path
+from dotenv import dotenv_values
+from datetime import datetime
+
+# orjson разбирает JSON в несколько раз быстрее; без него используется стандартный json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Настройка логирования
+log_dir = Path("logs")
+log_dir.mkdir(exist_ok=True)
+
+log_handlers = [
+    logging.FileHandler(log_dir / f"gumtree_auto_relister_{datetime.now().strftime('%Y%m%d')}.log"),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+# Запись в файл и консоль выполняется в фоновом потоке, вызовы логгера только кладут запись в очередь
+log_queue = queue.Queue(-1)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))  # полный формат применяют конечные обработчики
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger("GumtreeAutoRelister")
+
+def _load_env_cached(path):
+    """Чтение .env с кэшем в .env.cache.json: файл разбирается заново только после изменения"""
+    env_path = Path(path)
+    if not env_path.exists():
+        return {}
+    
+    cache_path = env_path.with_name(env_path.name + ".cache.json")
+    mtime = env_path.stat().st_mtime
+    try:
+        cache = json.loads(cache_path.read_text(encoding='utf-8'))
+        if cache["mtime"] == mtime:
+            return cache["values"]
+    except (OSError, KeyError, TypeError, ValueError):
+        pass  # Кэша нет или он поврежден - разбираем .env заново
+    
+    values = {key: value for key, value in dotenv_values(env_path).items() if value is not None}
+    try:
+        # В кэше лежат учетные данные: файл доступен только владельцу, как и сам .env
+        fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        if hasattr(os, "fchmod"):  # права уже существующего файла O_CREAT не меняет
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"mtime": mtime, "values": values}, f)
+    except OSError as e:
+        logger.warning("Не удалось сохранить кэш %s: %s", cache_path, e)
+    return values
+
+# Загрузка переменных окружения из файла .env; как и раньше, переменные процесса имеют приоритет.
+# Снимок окружения: настройки читаются из обычного словаря, а не через os.environ
+_ENV = {**_load_env_cached(Path(__file__).with_name(".env")), **os.environ}
+
+# Конфигурация
+GUMTREE_EMAIL = _ENV.get("GUMTREE_EMAIL")
+GUMTREE_PASSWORD = _ENV.get("GUMTREE_PASSWORD")
+RELIST_INTERVAL_HOURS = int(_ENV.get("RELIST_INTERVAL_HOURS", "24"))
+HEADLESS = _ENV.get("HEADLESS", "True").lower() == "true"
+# Включать только при маленьком /dev/shm (64 МБ по умолчанию в Docker); лучше запускать контейнер с --shm-size=2g
+SMALL_SHM = _ENV.get("SMALL_SHM", "False").lower() == "true"
+BLOCK_IMAGES = _ENV.get("BLOCK_IMAGES", "True").lower() == "true"  # не отображать картинки на страницах (загрузка файлов работает)
+BLOCK_RESOURCES = _ENV.get("BLOCK_RESOURCES", "True").lower() == "true"  # блокировать загрузку картинок, шрифтов и трекеров
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.woff", "*.woff2",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*", "*facebook.net*"
+]
+AD_DATA_FILE = _ENV.get("AD_DATA_FILE", "ad_data.json")
+ACCOUNTS_FILE = _ENV.get("ACCOUNTS_FILE", "accounts.json")  # список аккаунтов для параллельной работы
+MAX_PARALLEL = int(_ENV.get("MAX_PARALLEL", "4"))  # максимум одновременно открытых браузеров
+# Адрес Selenium Grid / standalone-chrome (например http://selenium:4444/wd/hub); пусто - локальный Chrome.
+# Число параллельных сессий на узле задается на стороне сервера через SE_NODE_MAX_SESSIONS
+# (не меньше MAX_PARALLEL; ориентир - около 4 сессий на 8 ГБ памяти)
+SELENIUM_REMOTE_URL = _ENV.get("SELENIUM_REMOTE_URL")
+MAX_RETRIES = int(_ENV.get("MAX_RETRIES", "3"))
+RANDOM_DELAY_MIN = int(_ENV.get("RANDOM_DELAY_MIN", "0"))  # минимальная задержка в минутах
+RANDOM_DELAY_MAX = int(_ENV.get("RANDOM_DELAY_MAX", "30"))  # максимальная задержка в минутах
+USE_BUMP = _ENV.get("USE_BUMP", "False").lower() == "true"  # поднимать объявление вместо удаления и повторной подачи
+DRIVER_MAX_USES = int(_ENV.get("DRIVER_MAX_USES", "10"))  # количество запусков задачи до перезапуска браузера
+
+def _log_fatal(prefix, e):
+    """Запись необработанной ошибки; трассировка формируется только при уровне DEBUG"""
+    logger.error("%s: %s", prefix, e)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(traceback.format_exc())
+
+def load_ad_data(path=None):
+    """Загрузка и проверка данных объявления из файла, без запуска браузера"""
+    ad_data_path = Path(path or AD_DATA_FILE)
+    try:
+        if not ad_data_path.exists():
+            logger.error("Файл с данными объявления не найден: %s", ad_data_path)
+            return None
+        
+        ad_data = json_loads(ad_data_path.read_bytes())
+        logger.info("Данные объявления успешно загружены из %s", ad_data_path)
+        
+        # Проверка обязательных полей
+        required_fields = ["title", "description", "postcode"]
+        missing_fields = [field for field in required_fields if field not in ad_data]
+        
+        if missing_fields:
+            logger.warning("В данных объявления отсутствуют обязательные поля: %s", ", ".join(missing_fields))
+        
+        return ad_data
+    except json.JSONDecodeError as e:
+        logger.error("Ошибка формата JSON в файле данных объявления: %s", e)
+        return None
+    except Exception as e:
+        logger.error("Не удалось загрузить данные объявления из файла: %s", e)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        return None
+
+# Коды завершения: супервизор (например, systemd) не должен перезапускать процесс при ошибке конфигурации
+EXIT_OK = 0
+EXIT_CONFIG_ERROR = 1
+EXIT_USAGE_ERROR = 2
+EXIT_FATAL_ERROR = 3
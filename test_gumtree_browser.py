@@ -0,0 +1,55 @@
+import os
+import signal
+import threading
+import time
+import unittest
+from unittest import mock
+
+import gumtree_browser as relister_module
+
+
+def _send_signal_later(signum, delay=0.5):
+    timer = threading.Timer(delay, os.kill, (os.getpid(), signum))
+    timer.start()
+    return timer
+
+
+class StopSignalTest(unittest.TestCase):
+    """Остановка планировщика по SIGINT/SIGTERM во время ожидания"""
+
+    def setUp(self):
+        self.stop_event = threading.Event()
+        self.previous_handlers = relister_module._install_stop_handlers(self.stop_event)
+
+    def tearDown(self):
+        for sig, handler in self.previous_handlers.items():
+            signal.signal(sig, handler)
+
+    def test_sigint_interrupts_wait(self):
+        _send_signal_later(signal.SIGINT)
+        started = time.monotonic()
+        self.assertTrue(self.stop_event.wait(10))
+        self.assertLess(time.monotonic() - started, 5)
+        # Повторный Ctrl+C обрабатывается прежним обработчиком, SIGTERM по-прежнему только выставляет флаг
+        self.assertIs(signal.getsignal(signal.SIGINT), self.previous_handlers[signal.SIGINT])
+        self.assertIsNot(signal.getsignal(signal.SIGTERM), self.previous_handlers[signal.SIGTERM])
+
+    def test_sigterm_stops_account_processes(self):
+        def run_job(relister):
+            # Как случайная задержка в run_job: ожидание прерывается только сигналом
+            return not relister.stop_event.wait(30)
+
+        accounts = [{"email": f"user{i}@example.com", "password": "secret", "ad_data_file": "ad_data.json"}
+                    for i in range(3)]
+        with mock.patch.object(relister_module, "MAX_PARALLEL", 2), \
+                mock.patch.object(relister_module.GumtreeAutoRelister, "run_job", run_job), \
+                mock.patch.object(relister_module.WebDriverWrapper, "close", lambda wrapper: None):
+            _send_signal_later(signal.SIGTERM, delay=1)
+            started = time.monotonic()
+            self.assertFalse(relister_module.run_accounts_parallel(accounts, self.stop_event))
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertTrue(self.stop_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()